@@ -4,7 +4,7 @@ import numpy as np
 import pandas as pd
 from argparse import ArgumentParser
 from pathlib import Path
-from sklearn.linear_model import LinearRegression
+from rumpus_common import read_frame_results, wrap_yaw_deg
 from scipy import stats
 import plotly.graph_objects as go
 from scipy.interpolate import griddata
@@ -18,70 +18,49 @@ def main():
     df = read_frame_results(args.PATH)
     solution_df = read_results(args.PATH / "results.csv")
 
-    df["candidate_yaw"] = ((df["car_yaw_deg"] + df["yaw_offset_deg"] + 180) % 360) - 180
-    df["delta_weighted_rmse"] = df["weighted_rmse"] - df.groupby("frame_index")[
-        "weighted_rmse"
-    ].transform("min")
-
-    frame_indices = sorted(df["frame_index"].unique())
-
-    # Build one frame per frame_index
-    frames = []
-    for fi in frame_indices:
-        frame_df = df[df["frame_index"] == fi].sort_values("candidate_yaw")
-        sol_row = solution_df[solution_df["frame_index"] == fi]
-
-        traces = [
-            go.Scatter(
-                x=frame_df["candidate_yaw"],
-                y=frame_df["delta_weighted_rmse"],
-                mode="lines+markers",
-                name="Error curve",
-                line=dict(color="steelblue"),
-                marker=dict(size=3),
-            )
-        ]
-
-        # Overlay the solution yaw as a vertical line if present
-        if not sol_row.empty:
-            sol_yaw = sol_row["car_yaw_deg"].values[0]
-            traces.append(
-                go.Scatter(
-                    x=[sol_yaw, sol_yaw],
-                    y=[0, frame_df["delta_weighted_rmse"].max()],
-                    mode="lines",
-                    name="Solution yaw",
-                    line=dict(color="red", width=2, dash="dash"),
-                )
-            )
+    df["candidate_yaw"] = wrap_yaw_deg(
+        (df["car_yaw_deg"] + df["yaw_offset_deg"]).to_numpy()
+    )
 
-        frames.append(go.Frame(data=traces, name=str(fi)))
+    # Sort so each frame's candidates form one contiguous segment, then take the
+    # per-frame minimum as a single segmented reduction
+    df = df.sort_values(["frame_index", "candidate_yaw"]).reset_index(drop=True)
+    frame_index = df["frame_index"].to_numpy()
+    weighted_rmse = df["weighted_rmse"].to_numpy()
+    starts = np.flatnonzero(np.r_[True, np.diff(frame_index) != 0])
+    frame_min = np.minimum.reduceat(weighted_rmse, starts)
+    df["delta_weighted_rmse"] = weighted_rmse - np.repeat(
+        frame_min, np.diff(np.r_[starts, len(df)])
+    )
 
-    # Initial frame data
-    init_df = df[df["frame_index"] == frame_indices[0]].sort_values("candidate_yaw")
-    init_sol = solution_df[solution_df["frame_index"] == frame_indices[0]]
+    # Each frame is a contiguous slice of the sorted candidates
+    frame_indices = frame_index[starts]
+    ends = np.r_[starts[1:], len(df)]
+    candidate_yaw = df["candidate_yaw"].to_numpy()
+    delta_weighted_rmse = df["delta_weighted_rmse"].to_numpy()
+    solution_yaw = (
+        solution_df.set_index("frame_index")["car_yaw_deg"]
+        .reindex(frame_indices)
+        .to_numpy()
+    )
 
-    init_traces = [
-        go.Scatter(
-            x=init_df["candidate_yaw"],
-            y=init_df["delta_weighted_rmse"],
-            mode="lines+markers",
-            name="Error curve",
-            line=dict(color="steelblue"),
-            marker=dict(size=3),
+    # Build one frame per frame_index
+    frames = [
+        go.Frame(
+            data=build_frame_traces(
+                candidate_yaw[start:end], delta_weighted_rmse[start:end], sol_yaw
+            ),
+            name=str(fi),
         )
+        for fi, start, end, sol_yaw in zip(frame_indices, starts, ends, solution_yaw)
     ]
-    if not init_sol.empty:
-        sol_yaw = init_sol["car_yaw_deg"].values[0]
-        init_traces.append(
-            go.Scatter(
-                x=[sol_yaw, sol_yaw],
-                y=[0, init_df["delta_weighted_rmse"].max()],
-                mode="lines",
-                name="Solution yaw",
-                line=dict(color="red", width=2, dash="dash"),
-            )
-        )
+
+    # Initial frame data
+    init_traces = build_frame_traces(
+        candidate_yaw[starts[0] : ends[0]],
+        delta_weighted_rmse[starts[0] : ends[0]],
+        solution_yaw[0],
+    )
 
     fig = go.Figure(data=init_traces, frames=frames)
 
@@ -159,15 +138,31 @@ def main():
     fig.show()
 
 
-def read_frame_results(path):
-    frame_results = []
-    frame_result_paths = sorted(path.glob("frame_*_results.csv"))
+def build_frame_traces(candidate_yaw, delta_weighted_rmse, sol_yaw):
+    traces = [
+        go.Scattergl(
+            x=candidate_yaw,
+            y=delta_weighted_rmse,
+            mode="lines+markers",
+            name="Error curve",
+            line=dict(color="steelblue"),
+            marker=dict(size=3),
+        )
+    ]
 
-    for path in frame_result_paths:
-        df = pd.read_csv(path)
-        frame_results.append(df)
+    # Overlay the solution yaw as a vertical line if present
+    if not np.isnan(sol_yaw):
+        traces.append(
+            go.Scattergl(
+                x=[sol_yaw, sol_yaw],
+                y=[0, delta_weighted_rmse.max()],
+                mode="lines",
+                name="Solution yaw",
+                line=dict(color="red", width=2, dash="dash"),
+            )
+        )
 
-    return pd.concat(frame_results, ignore_index=True)
+    return traces
 
 
 def read_results(path):
@@ -1,108 +1,201 @@
+import matplotlib
+
+# Figures are only saved, so skip the interactive backend
+matplotlib.use("Agg")
+
 import matplotlib.pyplot as plt
-import matplotlib as mpl
 import numpy as np
 import pandas as pd
 from argparse import ArgumentParser
+from itertools import cycle
 from pathlib import Path
-from sklearn.linear_model import LinearRegression
-
-mpl.rcParams.update(
-    {
-        # Font settings
-        "font.family": "serif",
-        # "font.serif": ["Times New Roman", "Times", "Computer Modern Roman"],
-        "mathtext.fontset": "cm",
-        # Font sizes scaled for 10pt LaTeX document
-        "font.size": 8,  # base font size
-        "axes.labelsize": 8,
-        "axes.titlesize": 8,
-        "xtick.labelsize": 6,
-        "ytick.labelsize": 6,
-        "legend.fontsize": 6,
-        # Figure aesthetics
-        "axes.linewidth": 0.8,
-        "lines.linewidth": 1.0,
-        "lines.markersize": 0.5,
-        "xtick.major.width": 0.8,
-        "ytick.major.width": 0.8,
-        # Save figures tightly
-        "figure.dpi": 300,
-        "savefig.bbox": "tight",
-        "savefig.pad_inches": 0.02,
-    }
-)
+from rumpus_common import compute_zenith_deg
+from xml.sax.saxutils import escape
+
+BENCHMARK_DTYPES = {
+    "frame_index": "int32",
+    "car_pitch_deg": "float32",
+    "car_roll_deg": "float32",
+    "weighted_rmse": "float32",
+}
+
+
+SVG_DPI = 96
+SVG_COLORS = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728"]
 
 
 def main():
     parser = ArgumentParser()
     parser.add_argument("csvs", nargs="+", type=Path)
+    parser.add_argument(
+        "--draft",
+        action="store_true",
+        help="write plain SVG previews without ticks instead of using matplotlib",
+    )
     args = parser.parse_args()
 
-    fig, ax = plt.subplots(figsize=(3.3, 2.5))
-
-    for path in args.csvs:
-        df = pd.read_csv(path)
-
-        df["pitch"] = np.deg2rad(df["car_pitch_deg"])
-        df["roll"] = np.deg2rad(df["car_roll_deg"])
-
-        df["zenith_angle"] = np.arccos(np.cos(df["pitch"]) * np.cos(df["roll"]))
-        df["zenith_angle_deg"] = np.rad2deg(df["zenith_angle"])
-
-        append_distribution(ax, df["weighted_rmse"], bins=10, density=False)
-
-    ax.set_xlabel("Weighted RMSE [deg]")
-    ax.set_ylabel("Number of Images")
-    ax.grid()
-
-    fig.savefig("wrmse_distribution.svg")
-
-    fig, ax = plt.subplots(figsize=(3.3, 2.5))
-
+    # Reduce each benchmark to its histogram lines as soon as it is read, so
+    # only one full DataFrame is alive at a time. The first two benchmarks
+    # also keep their per-frame WRMSE for the delta distribution.
+    wrmse_lines, zenith_lines, frame_wrmse = [], [], []
     for path in args.csvs:
-        df = pd.read_csv(path)
-
-        df["pitch"] = np.deg2rad(df["car_pitch_deg"])
-        df["roll"] = np.deg2rad(df["car_roll_deg"])
+        df = pd.read_csv(path, dtype=BENCHMARK_DTYPES)
+        zenith_angle_deg = compute_zenith_deg(
+            df["car_pitch_deg"].to_numpy(), df["car_roll_deg"].to_numpy()
+        )
+
+        wrmse_lines.append(
+            _compute_histogram_line(df["weighted_rmse"], bins=10, density=False)
+        )
+        zenith_lines.append(
+            _compute_histogram_line(zenith_angle_deg, bins=10, density=False)
+        )
+        if len(frame_wrmse) < 2:
+            frame_wrmse.append(df.set_index("frame_index")[["weighted_rmse"]])
+        del df
+
+    figures = [
+        ("wrmse_distribution.svg", "Weighted RMSE [deg]", wrmse_lines),
+        ("zenith_angle_distribution.svg", "Zenith Angle [deg]", zenith_lines),
+    ]
+
+    # The delta distribution needs a second benchmark to compare against
+    if len(frame_wrmse) == 2:
+        # Both benchmarks cover the same sorted frames, so join on the index
+        # instead of hashing the keys
+        paired = frame_wrmse[0].join(
+            frame_wrmse[1], how="inner", lsuffix="_x", rsuffix="_y"
+        )
+        delta_wrmse = paired["weighted_rmse_x"] - paired["weighted_rmse_y"]
+        delta_lines = [_compute_histogram_line(delta_wrmse, bins=10, density=False)]
+        figures.append(
+            (
+                "delta_wrmse_distribution.svg",
+                "$\\Delta$ Weighted RMSE [deg]",
+                delta_lines,
+            )
+        )
+
+    with plt.style.context(Path(__file__).with_name("rumpus_style.mplstyle")):
+        for path, xlabel, lines in figures:
+            if args.draft:
+                svg_line_plot(path, lines, xlabel, "Number of Images")
+                continue
+
+            fig, ax = plt.subplots(figsize=(3.3, 2.5))
+
+            for x, y in lines:
+                ax.plot(x, y)
+
+            ax.set_xlabel(xlabel)
+            ax.set_ylabel("Number of Images")
+            ax.grid()
+
+            fig.savefig(path)
 
-        df["zenith_angle"] = np.arccos(np.cos(df["pitch"]) * np.cos(df["roll"]))
-        df["zenith_angle_deg"] = np.rad2deg(df["zenith_angle"])
 
-        append_distribution(ax, df["zenith_angle_deg"], bins=10, density=False)
+def _compute_histogram_line(data, bins=50, density=True, range=None):
+    """
+    Compute histogram and return bin centers + values
+    suitable for line plotting.
+    """
+    data = np.asarray(data)
+    edges = np.histogram_bin_edges(data, bins=bins, range=range)
 
-    ax.set_xlabel("Zenith Angle [deg]")
-    ax.set_ylabel("Number of Images")
-    ax.grid()
+    if isinstance(bins, int):
+        counts = np.bincount(_equal_width_bin_indices(data, edges), minlength=bins)
+    else:
+        counts, _ = np.histogram(data, bins=edges)
 
-    fig.savefig("zenith_angle_distribution.svg")
+    if density:
+        counts = counts / np.diff(edges) / counts.sum()
 
-    fig, ax = plt.subplots(figsize=(3.3, 2.5))
+    centers = (edges[:-1] + edges[1:]) / 2
+    return centers, counts
 
-    df = pd.merge(
-        pd.read_csv(args.csvs[0]),
-        pd.read_csv(args.csvs[1])[["frame_index", "weighted_rmse"]],
-        how="inner",
-        on="frame_index",
-    )
 
-    delta_wrmse = df["weighted_rmse_x"] - df["weighted_rmse_y"]
-    append_distribution(ax, delta_wrmse, bins=10, density=False)
+def _equal_width_bin_indices(data, edges):
+    """
+    Return the bin index of every sample that falls inside
+    equal-width edges, with the last bin closed like np.histogram.
+    """
+    bins = len(edges) - 1
+    data = data[(data >= edges[0]) & (data <= edges[-1])]
 
-    ax.set_xlabel("$\\Delta$ Weighted RMSE [deg]")
-    ax.set_ylabel("Number of Images")
-    ax.grid()
+    indices = ((data - edges[0]) * (bins / (edges[-1] - edges[0]))).astype(np.intp)
+    indices = np.minimum(indices, bins - 1)
 
-    fig.savefig("delta_wrmse_distribution.svg")
+    # Move samples that rounding placed on the wrong side of an edge
+    indices -= data < edges[indices]
+    indices += (data >= edges[indices + 1]) & (indices != bins - 1)
+    return indices
 
 
-def _compute_histogram_line(data, bins=50, density=True, range=None):
+def svg_line_plot(path, lines, xlabel, ylabel, size=(3.3, 2.5)):
     """
-    Compute histogram and return bin centers + values
-    suitable for line plotting.
+    Write a minimal SVG line plot without going through matplotlib.
+
+    Meant for quick previews: only the lines, a frame, the
+    axis labels and the axis limits are drawn, with no ticks.
     """
-    counts, edges = np.histogram(data, bins=bins, density=density, range=range)
-    centers = (edges[:-1] + edges[1:]) / 2
-    return centers, counts
+    width, height = size[0] * SVG_DPI, size[1] * SVG_DPI
+    left, right, top, bottom = 36.0, width - 8.0, 8.0, height - 28.0
+
+    xs = np.concatenate([np.asarray(x, dtype=float) for x, _ in lines])
+    ys = np.concatenate([np.asarray(y, dtype=float) for _, y in lines])
+    x_lo, x_hi = _padded_limits(xs.min(), xs.max())
+    y_lo, y_hi = _padded_limits(ys.min(), ys.max())
+
+    x_scale = (right - left) / (x_hi - x_lo)
+    y_scale = (bottom - top) / (y_hi - y_lo)
+
+    elements = [
+        f'<rect x="{left:.2f}" y="{top:.2f}" width="{right - left:.2f}" '
+        f'height="{bottom - top:.2f}" fill="none" stroke="black" stroke-width="0.8"/>'
+    ]
+    for (x, y), color in zip(lines, cycle(SVG_COLORS)):
+        px = left + (np.asarray(x) - x_lo) * x_scale
+        py = bottom - (np.asarray(y) - y_lo) * y_scale
+        points = " ".join(f"{u:.2f},{v:.2f}" for u, v in zip(px, py))
+        elements.append(
+            f'<polyline fill="none" stroke="{color}" stroke-width="1" '
+            f'points="{points}"/>'
+        )
+
+    xlabel, ylabel = _svg_text(xlabel), _svg_text(ylabel)
+    elements += [
+        f'<text x="{left:.2f}" y="{bottom + 10:.2f}" font-size="6pt">{x_lo:.3g}</text>',
+        f'<text x="{right:.2f}" y="{bottom + 10:.2f}" font-size="6pt" '
+        f'text-anchor="end">{x_hi:.3g}</text>',
+        f'<text x="{left - 2:.2f}" y="{bottom:.2f}" font-size="6pt" '
+        f'text-anchor="end">{y_lo:.3g}</text>',
+        f'<text x="{left - 2:.2f}" y="{top + 6:.2f}" font-size="6pt" '
+        f'text-anchor="end">{y_hi:.3g}</text>',
+        f'<text x="{(left + right) / 2:.2f}" y="{height - 4:.2f}" '
+        f'text-anchor="middle">{xlabel}</text>',
+        f'<text transform="translate(10,{(top + bottom) / 2:.2f}) rotate(-90)" '
+        f'text-anchor="middle">{ylabel}</text>',
+    ]
+
+    with open(path, "w") as f:
+        f.write(
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.2f}" '
+            f'height="{height:.2f}" viewBox="0 0 {width:.2f} {height:.2f}" '
+            f'font-family="serif" font-size="8pt">\n'
+        )
+        f.write("\n".join(elements))
+        f.write("\n</svg>\n")
+
+
+def _padded_limits(lo, hi, margin=0.05):
+    if hi == lo:
+        return lo - 0.5, hi + 0.5
+    pad = (hi - lo) * margin
+    return lo - pad, hi + pad
+
+
+def _svg_text(label):
+    return escape(label.replace("$\\Delta$", "\u0394").replace("$", ""))
 
 
 def plot_distribution(data, bins=50, density=True, ax=None, label=None, **plot_kwargs):
@@ -1,39 +1,12 @@
 import matplotlib.pyplot as plt
-import matplotlib as mpl
 import numpy as np
 import pandas as pd
 from argparse import ArgumentParser
 from pathlib import Path
-from sklearn.linear_model import LinearRegression
+from rumpus_common import read_frame_results, wrap_yaw_deg
 from scipy import stats
 import plotly.graph_objects as go
-from scipy.interpolate import griddata
-
-mpl.rcParams.update(
-    {
-        # Font settings
-        "font.family": "serif",
-        # "font.serif": ["Times New Roman", "Times", "Computer Modern Roman"],
-        "mathtext.fontset": "cm",
-        # Font sizes scaled for 10pt LaTeX document
-        "font.size": 8,  # base font size
-        "axes.labelsize": 8,
-        "axes.titlesize": 8,
-        "xtick.labelsize": 6,
-        "ytick.labelsize": 6,
-        "legend.fontsize": 6,
-        # Figure aesthetics
-        "axes.linewidth": 0.8,
-        "lines.linewidth": 1.0,
-        "lines.markersize": 0.5,
-        "xtick.major.width": 0.8,
-        "ytick.major.width": 0.8,
-        # Save figures tightly
-        "figure.dpi": 300,
-        "savefig.bbox": "tight",
-        "savefig.pad_inches": 0.02,
-    }
-)
+from scipy.interpolate import RegularGridInterpolator
 
 
 def main():
@@ -44,15 +17,25 @@ def main():
     df = read_frame_results(args.PATH)
     solution_df = read_results(args.PATH / "results.csv")
 
-    df["candidate_yaw"] = ((df["car_yaw_deg"] + df["yaw_offset_deg"] + 180) % 360) - 180
-    df["delta_weighted_rmse"] = df["weighted_rmse"] - df.groupby("frame_index")[
-        "weighted_rmse"
-    ].transform("min")
+    df["candidate_yaw"] = wrap_yaw_deg(
+        (df["car_yaw_deg"] + df["yaw_offset_deg"]).to_numpy()
+    )
 
-    # --- Unwrap candidate_yaw to make it continuous across the -180/180 boundary ---
-    # Sort by frame_index so unwrapping is meaningful across time
+    # Sort by frame_index so unwrapping is meaningful across time and so each
+    # frame's candidates form one contiguous segment
     df = df.sort_values(["frame_index", "candidate_yaw"]).reset_index(drop=True)
 
+    # Per-frame minimum as a single segmented reduction over the sorted rows
+    frame_index = df["frame_index"].to_numpy()
+    weighted_rmse = df["weighted_rmse"].to_numpy()
+    starts = np.flatnonzero(np.r_[True, np.diff(frame_index) != 0])
+    frame_min = np.minimum.reduceat(weighted_rmse, starts)
+    df["delta_weighted_rmse"] = weighted_rmse - np.repeat(
+        frame_min, np.diff(np.r_[starts, len(df)])
+    )
+
+    # --- Unwrap candidate_yaw to make it continuous across the -180/180 boundary ---
+
     # Unwrap per frame: within each frame the yaw values are a discrete set,
     # but we need the global yaw axis to be continuous. Unwrap the per-frame
     # yaw range boundaries across frames to detect wrapping.
@@ -61,9 +44,9 @@ def main():
     yaw_unwrapped = np.unwrap(np.deg2rad(yaw_sorted))  # unwrap in radians
     yaw_unwrapped_deg = np.rad2deg(yaw_unwrapped)
 
-    # Build a mapping from wrapped -> unwrapped yaw
-    yaw_map = dict(zip(yaw_sorted, yaw_unwrapped_deg))
-    df["candidate_yaw_unwrapped"] = df["candidate_yaw"].map(yaw_map)
+    # Map wrapped -> unwrapped yaw by locating each value in the sorted unique yaws
+    yaw_idx = np.searchsorted(yaw_sorted, df["candidate_yaw"].to_numpy())
+    df["candidate_yaw_unwrapped"] = yaw_unwrapped_deg[yaw_idx]
 
     # Also unwrap solution yaw for the scatter overlay
     solution_yaw_rad = np.unwrap(np.deg2rad(solution_df["car_yaw_deg"].values))
@@ -78,14 +61,41 @@ def main():
 
     X, Y = np.meshgrid(yaw_lin, time_lin)
 
-    Z = griddata(
-        points=(df["candidate_yaw_unwrapped"], df["frame_index"]),
-        values=df["delta_weighted_rmse"],
-        xi=(X, Y),
+    # Frames are assumed to evaluate the same yaw offsets around their car yaw,
+    # so the candidates form a regular (frame_index, yaw_offset) grid.
+    # Interpolate on that grid instead of triangulating the scattered (yaw,
+    # frame) points. Candidates can still be skipped (e.g. when the zenith is
+    # outside the camera FOV), so fill the holes along the offset axis first;
+    # otherwise the linear interpolator spreads each NaN cell into the
+    # neighbouring rows. Skipped offsets at the ends of a frame's band repeat
+    # its outermost evaluated candidate.
+    error_grid = df.pivot_table(
+        index="frame_index", columns="yaw_offset_deg", values="delta_weighted_rmse"
+    ).interpolate(method="index", axis=1, limit_direction="both")
+    offsets = error_grid.columns.to_numpy()
+    error_interp = RegularGridInterpolator(
+        (error_grid.index.to_numpy(), offsets),
+        error_grid.to_numpy(),
         method="linear",
-        fill_value=100e-6,
+        bounds_error=False,
     )
 
+    # Car yaw of each frame, unwrapped so it can be interpolated across time
+    frame_car_yaw = np.rad2deg(
+        np.unwrap(
+            np.deg2rad(df.groupby("frame_index")["car_yaw_deg"].first().to_numpy())
+        )
+    )
+    car_yaw_lin = np.interp(time_lin, error_grid.index.to_numpy(), frame_car_yaw)
+    offset = ((X - car_yaw_lin[:, None] + 180) % 360) - 180
+
+    # Between frames the car yaw is interpolated, but the mask below keeps the
+    # nearest frame's band, so cells at its edge can fall just outside the
+    # offset grid. Clamp them onto the outermost offsets
+    np.clip(offset, offsets.min(), offsets.max(), out=offset)
+
+    Z = error_interp(np.stack([Y, offset], axis=-1))
+
     # --- Mask grid cells that are outside the actual yaw range for each frame ---
     # For each row in the grid (each time_lin value), find the nearest frame's
     # actual yaw extent and mask columns outside it.
@@ -95,23 +105,26 @@ def main():
         .reset_index()
     )
 
-    for i, t in enumerate(time_lin):
-        # Find the closest frame(s) to this time value
-        nearest_idx = (frame_yaw_extent["frame_index"] - t).abs().idxmin()
-        yaw_min = frame_yaw_extent.loc[nearest_idx, "min"]
-        yaw_max = frame_yaw_extent.loc[nearest_idx, "max"]
-        # Mask columns outside the valid yaw range for this time slice
-        out_of_range = (yaw_lin < yaw_min) | (yaw_lin > yaw_max)
-        Z[i, out_of_range] = np.nan
+    # Find the closest frame to each time value among its sorted neighbours,
+    # preferring the earlier frame on ties
+    extent_frames = frame_yaw_extent["frame_index"].to_numpy()
+    right = np.searchsorted(extent_frames, time_lin)
+    left = np.clip(right - 1, 0, len(extent_frames) - 1)
+    right = np.clip(right, 0, len(extent_frames) - 1)
+    nearest_idx = np.where(
+        np.abs(time_lin - extent_frames[left])
+        <= np.abs(extent_frames[right] - time_lin),
+        left,
+        right,
+    )
+    yaw_min = frame_yaw_extent["min"].to_numpy()[nearest_idx, None]
+    yaw_max = frame_yaw_extent["max"].to_numpy()[nearest_idx, None]
 
-    fig.add_trace(go.Surface(x=X, y=Y, z=Z, opacity=0.8, hoverinfo="skip"))
+    # Mask columns outside the valid yaw range for each time slice
+    out_of_range = (yaw_lin[None, :] < yaw_min) | (yaw_lin[None, :] > yaw_max)
+    Z[out_of_range] = np.nan
 
-    solution_Z = griddata(
-        points=(df["candidate_yaw_unwrapped"], df["frame_index"]),
-        values=df["delta_weighted_rmse"],
-        xi=(solution_yaw_unwrapped, solution_df["frame_index"]),
-        method="linear",
-    )
+    fig.add_trace(go.Surface(x=X, y=Y, z=Z, opacity=0.8, hoverinfo="skip"))
 
     fig.add_trace(
         go.Scatter3d(
@@ -138,17 +151,6 @@ def main():
     fig.show()
 
 
-def read_frame_results(path):
-    frame_results = []
-    frame_result_paths = sorted(path.glob("frame_*_results.csv"))
-
-    for path in frame_result_paths:
-        df = pd.read_csv(path)
-        frame_results.append(df)
-
-    return pd.concat(frame_results, ignore_index=True)
-
-
 def read_results(path):
     return pd.read_csv(path)
 
@@ -3,6 +3,7 @@ import numpy as np
 import pandas as pd
 from argparse import ArgumentParser
 from pathlib import Path
+from rumpus_common import read_frame_results, wrap_yaw_deg
 
 
 def main():
@@ -13,21 +14,32 @@ def main():
     df = read_frame_results(args.PATH)
     solution_df = read_results(args.PATH / "results.csv")
 
-    df["candidate_yaw"] = ((df["car_yaw_deg"] + df["yaw_offset_deg"] + 180) % 360) - 180
+    df["candidate_yaw"] = wrap_yaw_deg(
+        (df["car_yaw_deg"] + df["yaw_offset_deg"]).to_numpy()
+    )
 
     # Pick the candidate with the smallest weighted_rmse per frame
-    best_candidates = df.loc[df.groupby("frame_index")["weighted_rmse"].idxmin()].copy()
-    best_candidates = best_candidates.sort_values("frame_index").reset_index(drop=True)
+    best_candidates = (
+        df.sort_values(["frame_index", "weighted_rmse"])
+        .drop_duplicates("frame_index", keep="first")
+        .reset_index(drop=True)
+    )
 
-    # Merge with solution
-    merged = best_candidates.merge(
-        solution_df[["frame_index", "car_yaw_deg"]],
-        on="frame_index",
-        suffixes=("_candidate", "_solution"),
+    # Join with solution on the sorted frame_index
+    merged = (
+        best_candidates.set_index("frame_index")
+        .join(
+            solution_df.set_index("frame_index")[["car_yaw_deg"]],
+            how="inner",
+            lsuffix="_candidate",
+            rsuffix="_solution",
+        )
+        .reset_index()
     )
-    merged["yaw_error"] = merged["candidate_yaw"] - merged["car_yaw_deg_solution"]
     # Wrap error to [-180, 180]
-    merged["yaw_error"] = ((merged["yaw_error"] + 180) % 360) - 180
+    merged["yaw_error"] = wrap_yaw_deg(
+        (merged["candidate_yaw"] - merged["car_yaw_deg_solution"]).to_numpy()
+    )
 
     abs_error = merged["yaw_error"].abs()
     print("=== Yaw Error Summary (Best Candidate vs Solution) ===")
@@ -81,19 +93,8 @@ def main():
     plt.show()
 
 
-def read_frame_results(path):
-    frame_results = []
-    frame_result_paths = sorted(path.glob("frame_*_results.csv"))
-
-    for path in frame_result_paths:
-        df = pd.read_csv(path)
-        frame_results.append(df)
-
-    return pd.concat(frame_results, ignore_index=True)
-
-
 def read_results(path):
-    return pd.read_csv(path)
+    return pd.read_csv(path, dtype={"frame_index": "int32"})
 
 
 if __name__ == "__main__":
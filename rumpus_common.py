@@ -0,0 +1,100 @@
+import json
+import math
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pac
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+from numba import njit, prange
+
+FRAME_RESULT_TYPES = {
+    "frame_index": pa.int32(),
+    "car_yaw_deg": pa.float64(),
+    "yaw_offset_deg": pa.float64(),
+    "weighted_rmse": pa.float64(),
+}
+
+CACHE_MANIFEST_KEY = b"rumpus_manifest"
+
+
+def read_frame_results(path):
+    frame_result_paths = sorted(path.glob("frame_*_results.csv"))
+
+    # Reuse the concatenated results while they were built from exactly these
+    # frame CSVs
+    cache_path = path / "_frames.feather"
+    df = read_cache(cache_path, frame_result_paths, list(FRAME_RESULT_TYPES))
+    if df is not None:
+        return df
+
+    # Scan the frame CSVs as one dataset so Arrow parses them in parallel and
+    # builds a single table without a separate concatenation
+    frame_results = ds.dataset(
+        [str(p) for p in frame_result_paths],
+        format=ds.CsvFileFormat(
+            convert_options=pac.ConvertOptions(column_types=FRAME_RESULT_TYPES)
+        ),
+    )
+    df = frame_results.to_table(columns=list(FRAME_RESULT_TYPES)).to_pandas(
+        self_destruct=True
+    )
+    write_cache(df, cache_path, frame_result_paths)
+    return df
+
+
+def read_cache(cache_path, source_paths, columns):
+    try:
+        table = feather.read_table(cache_path)
+    except (OSError, pa.ArrowInvalid):
+        return None
+
+    # Only trust a cache built from the same inputs with the expected columns
+    metadata = table.schema.metadata or {}
+    if (
+        metadata.get(CACHE_MANIFEST_KEY) != source_manifest(source_paths)
+        or table.column_names != columns
+    ):
+        return None
+    return table.to_pandas()
+
+
+def write_cache(df, cache_path, source_paths):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata(
+        {**table.schema.metadata, CACHE_MANIFEST_KEY: source_manifest(source_paths)}
+    )
+    try:
+        feather.write_feather(table, cache_path)
+    except OSError:
+        # The results directory may be read-only, in which case run uncached
+        pass
+
+
+def source_manifest(paths):
+    # Name, size and modification time of every input, so adding, removing or
+    # rewriting any of them invalidates the cache
+    return json.dumps(
+        [[p.name, p.stat().st_size, p.stat().st_mtime_ns] for p in paths]
+    ).encode()
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def compute_zenith_deg(pitch_deg, roll_deg):
+    """
+    Compute the zenith angle of the car in degrees from its
+    pitch and roll in a single compiled pass.
+    """
+    out = np.empty(pitch_deg.shape, np.float64)
+    for i in prange(pitch_deg.size):
+        pitch = math.radians(pitch_deg[i])
+        roll = math.radians(roll_deg[i])
+        out[i] = math.degrees(math.acos(math.cos(pitch) * math.cos(roll)))
+    return out
+
+
+@njit(parallel=True, cache=True)
+def wrap_yaw_deg(yaw_deg):
+    out = np.empty_like(yaw_deg)
+    for i in prange(yaw_deg.size):
+        out[i] = ((yaw_deg[i] + 180.0) % 360.0) - 180.0
+    return out
@@ -1,38 +1,9 @@
-import matplotlib.pyplot as plt
-import matplotlib as mpl
 import numpy as np
 import pandas as pd
 from argparse import ArgumentParser
 from pathlib import Path
-from sklearn.linear_model import LinearRegression
 from scipy import stats
 
-mpl.rcParams.update(
-    {
-        # Font settings
-        "font.family": "serif",
-        # "font.serif": ["Times New Roman", "Times", "Computer Modern Roman"],
-        "mathtext.fontset": "cm",
-        # Font sizes scaled for 10pt LaTeX document
-        "font.size": 8,  # base font size
-        "axes.labelsize": 8,
-        "axes.titlesize": 8,
-        "xtick.labelsize": 6,
-        "ytick.labelsize": 6,
-        "legend.fontsize": 6,
-        # Figure aesthetics
-        "axes.linewidth": 0.8,
-        "lines.linewidth": 1.0,
-        "lines.markersize": 0.5,
-        "xtick.major.width": 0.8,
-        "ytick.major.width": 0.8,
-        # Save figures tightly
-        "figure.dpi": 300,
-        "savefig.bbox": "tight",
-        "savefig.pad_inches": 0.02,
-    }
-)
-
 """
 How can we measure the effect of the treatment on the WRMSE metric?
 
@@ -59,29 +30,28 @@ def main():
     parser.add_argument("treatment", type=Path)
     args = parser.parse_args()
 
-    df_control = pd.read_csv(args.control)
-    df_treatmt = pd.read_csv(args.treatment)
-
-    df = pd.merge(
-        df_control,
-        df_treatmt[["frame_index", "weighted_rmse"]],
-        how="inner",
-        on="frame_index",
+    df_control = pd.read_csv(args.control, dtype={"frame_index": "int32"})
+    df_treatmt = pd.read_csv(args.treatment, dtype={"frame_index": "int32"})
+
+    # Both runs cover the same sorted frames, so join on the index
+    # instead of hashing the keys
+    df = (
+        df_control.set_index("frame_index")
+        .join(
+            df_treatmt.set_index("frame_index")[["weighted_rmse"]],
+            how="inner",
+            lsuffix="_x",
+            rsuffix="_y",
+        )
+        .reset_index()
     )
 
-    df["pitch"] = np.deg2rad(df["car_pitch_deg"])
-    df["roll"] = np.deg2rad(df["car_roll_deg"])
-    df["zenith_angle"] = np.arccos(np.cos(df["pitch"]) * np.cos(df["roll"]))
-    df["zenith_angle_deg"] = np.rad2deg(df["zenith_angle"])
-
-    # Paired t-test (two-sided by default)
-    t_stat, p_two_sided = stats.ttest_rel(df["weighted_rmse_x"], df["weighted_rmse_y"])
-
-    # Convert to one-sided test (treatment reduces WRMSE)
-    if t_stat > 0:
-        p_one_sided = p_two_sided / 2
-    else:
-        p_one_sided = 1 - (p_two_sided / 2)
+    # One-sided paired t-test (treatment reduces WRMSE)
+    t_stat, p_one_sided = stats.ttest_rel(
+        df["weighted_rmse_x"].to_numpy(),
+        df["weighted_rmse_y"].to_numpy(),
+        alternative="greater",
+    )
 
     print("---- SIGNIFICANCE")
     print("t statistic:", t_stat)
@@ -3,6 +3,7 @@ import numpy as np
 import pandas as pd
 from argparse import ArgumentParser
 from pathlib import Path
+from rumpus_common import read_frame_results, wrap_yaw_deg
 
 
 def main():
@@ -13,22 +14,33 @@ def main():
     args = parser.parse_args()
 
     df = read_frame_results(args.PATH)
-    solution_df = pd.read_csv(args.PATH / "results.csv")
+    solution_df = pd.read_csv(args.PATH / "results.csv", dtype={"frame_index": "int32"})
 
-    df["candidate_yaw"] = ((df["car_yaw_deg"] + df["yaw_offset_deg"] + 180) % 360) - 180
+    df["candidate_yaw"] = wrap_yaw_deg(
+        (df["car_yaw_deg"] + df["yaw_offset_deg"]).to_numpy()
+    )
 
     # Pick the candidate with the smallest weighted_rmse per frame
-    best_candidates = df.loc[df.groupby("frame_index")["weighted_rmse"].idxmin()].copy()
-    best_candidates = best_candidates.sort_values("frame_index").reset_index(drop=True)
+    best_candidates = (
+        df.sort_values(["frame_index", "weighted_rmse"])
+        .drop_duplicates("frame_index", keep="first")
+        .reset_index(drop=True)
+    )
 
-    # Merge with solution and compute wrapped yaw error
-    merged = best_candidates.merge(
-        solution_df[["frame_index", "car_yaw_deg"]],
-        on="frame_index",
-        suffixes=("_candidate", "_solution"),
+    # Join with solution on the sorted frame_index and compute wrapped yaw error
+    merged = (
+        best_candidates.set_index("frame_index")
+        .join(
+            solution_df.set_index("frame_index")[["car_yaw_deg"]],
+            how="inner",
+            lsuffix="_candidate",
+            rsuffix="_solution",
+        )
+        .reset_index()
+    )
+    merged["yaw_error"] = wrap_yaw_deg(
+        (merged["candidate_yaw"] - merged["car_yaw_deg_solution"]).to_numpy()
     )
-    merged["yaw_error"] = merged["candidate_yaw"] - merged["car_yaw_deg_solution"]
-    merged["yaw_error"] = ((merged["yaw_error"] + 180) % 360) - 180
 
     errors = merged["yaw_error"]
     abs_errors = errors.abs()
@@ -92,12 +104,5 @@ def main():
     plt.show()
 
 
-def read_frame_results(path):
-    frame_results = []
-    for p in sorted(path.glob("frame_*_results.csv")):
-        frame_results.append(pd.read_csv(p))
-    return pd.concat(frame_results, ignore_index=True)
-
-
 if __name__ == "__main__":
     main()
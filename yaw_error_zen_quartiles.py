@@ -1,8 +1,26 @@
+import sys
+import matplotlib
+
+# Batch runs only save the figure, so skip the interactive backend
+if not sys.stdout.isatty():
+    matplotlib.use("Agg")
+
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
+from numba import njit
 from argparse import ArgumentParser
 from pathlib import Path
+from rumpus_common import (
+    FRAME_RESULT_TYPES,
+    compute_zenith_deg,
+    read_cache,
+    read_frame_results,
+    wrap_yaw_deg,
+    write_cache,
+)
+
+CDF_MAX_POINTS = 2000
 
 
 def main():
@@ -10,48 +28,77 @@ def main():
         description="Plot absolute yaw error CDF segmented by zenith_angle_deg quartile."
     )
     parser.add_argument("PATH", type=Path)
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="plot every frame on each CDF instead of a downsampled curve",
+    )
     args = parser.parse_args()
 
-    df = read_frame_results(args.PATH)
-    solution_df = pd.read_csv(args.PATH / "results.csv")
-    solution_df["pitch"] = np.deg2rad(solution_df["car_pitch_deg"])
-    solution_df["roll"] = np.deg2rad(solution_df["car_roll_deg"])
-
-    solution_df["zenith_angle"] = np.arccos(
-        np.cos(solution_df["pitch"]) * np.cos(solution_df["roll"])
+    best_candidates = read_best_candidates(args.PATH)
+    solution_df = pd.read_csv(
+        args.PATH / "results.csv",
+        usecols=["frame_index", "car_pitch_deg", "car_roll_deg", "car_yaw_deg"],
+        dtype={"frame_index": "int32"},
     )
-    solution_df["zenith_angle_deg"] = np.rad2deg(solution_df["zenith_angle"])
-
-    df["candidate_yaw"] = ((df["car_yaw_deg"] + df["yaw_offset_deg"] + 180) % 360) - 180
 
-    # Pick the candidate with the smallest weighted_rmse per frame
-    best_candidates = df.loc[df.groupby("frame_index")["weighted_rmse"].idxmin()].copy()
-    best_candidates = best_candidates.sort_values("frame_index").reset_index(drop=True)
-
-    # Merge with solution
-    merged = best_candidates.merge(
-        solution_df[["frame_index", "car_yaw_deg", "zenith_angle_deg"]],
-        on="frame_index",
-        suffixes=("_candidate", "_solution"),
+    # Pair each best candidate with its solution frame as plain arrays, keeping
+    # only frames present in both like an inner join
+    _, candidate_idx, solution_idx = np.intersect1d(
+        best_candidates["frame_index"].to_numpy(),
+        solution_df["frame_index"].to_numpy(),
+        assume_unique=True,
+        return_indices=True,
+    )
+    zenith_deg = compute_zenith_deg(
+        solution_df["car_pitch_deg"].to_numpy()[solution_idx],
+        solution_df["car_roll_deg"].to_numpy()[solution_idx],
     )
-    merged["yaw_error"] = merged["candidate_yaw"] - merged["car_yaw_deg_solution"]
-    merged["yaw_error"] = ((merged["yaw_error"] + 180) % 360) - 180
-    merged["abs_yaw_error"] = merged["yaw_error"].abs()
 
-    # Assign zenith quartiles
-    merged["zenith_quartile"] = pd.qcut(merged["zenith_angle_deg"], q=4)
-    quartiles = merged["zenith_quartile"].cat.categories
+    # Wrap error to [-180, 180] and take its magnitude in place
+    abs_yaw_error = wrap_yaw_deg(
+        best_candidates["candidate_yaw"].to_numpy()[candidate_idx]
+        - solution_df["car_yaw_deg"].to_numpy()[solution_idx]
+    )
+    np.abs(abs_yaw_error, out=abs_yaw_error)
+
+    # Assign zenith quartiles by locating each angle among the quartile edges,
+    # with bins closed on the right as in pd.qcut
+    edges = np.quantile(zenith_deg, [0.25, 0.5, 0.75])
+    zenith_quartile = np.searchsorted(edges, zenith_deg).astype(np.int8)
+    bounds = [zenith_deg.min(), *edges, zenith_deg.max()]
+    quartiles = [f"({lo:.3f}, {hi:.3f}]" for lo, hi in zip(bounds, bounds[1:])]
+    # The minimum itself falls in the first quartile
+    quartiles[0] = f"[{bounds[0]:.3f}, {bounds[1]:.3f}]"
+
+    # Sort all errors once, then gather each quartile's errors into its own
+    # contiguous segment, which stays sorted
+    order = np.argsort(abs_yaw_error)
+    grouped_err, starts = group_by_label(
+        abs_yaw_error[order], zenith_quartile[order], len(quartiles)
+    )
 
     colors = ["steelblue", "darkorange", "seagreen", "crimson"]
 
+    # Prepare every curve up front so the plotting loop only draws
+    curves = []
+    for quartile, (name, color) in enumerate(zip(quartiles, colors)):
+        sorted_err = grouped_err[starts[quartile] : starts[quartile + 1]]
+        cdf = np.arange(1, len(sorted_err) + 1) / len(sorted_err)
+        label = f"{name} (n={len(sorted_err)})"
+
+        # A few thousand evenly spaced points are indistinguishable from the
+        # full curve at the saved resolution
+        if not args.full and len(sorted_err) > CDF_MAX_POINTS:
+            keep = np.linspace(0, len(sorted_err) - 1, CDF_MAX_POINTS).astype(np.intp)
+            sorted_err, cdf = sorted_err[keep], cdf[keep]
+
+        curves.append((sorted_err, cdf * 100, label, color))
+
     fig, ax = plt.subplots(figsize=(9, 6))
 
-    for quartile, color in zip(quartiles, colors):
-        subset = merged[merged["zenith_quartile"] == quartile]["abs_yaw_error"]
-        sorted_err = np.sort(subset)
-        cdf = np.arange(1, len(sorted_err) + 1) / len(sorted_err)
-        label = f"{quartile} (n={len(subset)})"
-        ax.plot(sorted_err, cdf * 100, color=color, linewidth=2, label=label)
+    for sorted_err, cdf_pct, label, color in curves:
+        ax.plot(sorted_err, cdf_pct, color=color, linewidth=2, label=label)
 
     for threshold, style in [(0.1, "--"), (0.5, ":"), (1.0, "-.")]:
         ax.axvline(
@@ -70,14 +117,54 @@ def main():
 
     plt.tight_layout()
     plt.savefig("yaw_error_cdf_by_zenith.png", dpi=150)
-    plt.show()
+    if sys.stdout.isatty():
+        plt.show()
+    plt.close(fig)
+
+
+def read_best_candidates(path):
+    frame_result_paths = sorted(path.glob("frame_*_results.csv"))
 
+    # The best candidates only change with the frame CSVs, so reuse the cached
+    # ones instead of reloading every candidate
+    cache_path = path / "_best.feather"
+    columns = [*FRAME_RESULT_TYPES, "candidate_yaw"]
+    best_candidates = read_cache(cache_path, frame_result_paths, columns)
+    if best_candidates is not None:
+        return best_candidates
+
+    df = read_frame_results(path)
+    df["candidate_yaw"] = wrap_yaw_deg(
+        (df["car_yaw_deg"] + df["yaw_offset_deg"]).to_numpy()
+    )
+
+    # Pick the candidate with the smallest weighted_rmse per frame
+    best_candidates = (
+        df.sort_values(["frame_index", "weighted_rmse"])
+        .drop_duplicates("frame_index", keep="first")
+        .reset_index(drop=True)
+    )
 
-def read_frame_results(path):
-    frame_results = []
-    for p in sorted(path.glob("frame_*_results.csv")):
-        frame_results.append(pd.read_csv(p))
-    return pd.concat(frame_results, ignore_index=True)
+    write_cache(best_candidates, cache_path, frame_result_paths)
+    return best_candidates
+
+
+@njit(cache=True)
+def group_by_label(values, labels, n_labels):
+    starts = np.zeros(n_labels + 1, dtype=np.int64)
+    for i in range(labels.size):
+        starts[labels[i] + 1] += 1
+    starts = np.cumsum(starts)
+
+    # Scatter each value to the next free slot of its label's segment, which
+    # keeps every segment in input order
+    fill = starts[:-1].copy()
+    out = np.empty_like(values)
+    for i in range(values.size):
+        label = labels[i]
+        out[fill[label]] = values[i]
+        fill[label] += 1
+    return out, starts
 
 
 if __name__ == "__main__":